@@ -1,21 +1,33 @@
 import os
-import math
 import pathlib
+import functools
+import collections
 import torch
+import torch.nn.functional as F
 import numpy as np
-from PIL import Image
-import matplotlib.pyplot as plt
+from torchvision.io import ImageReadMode, decode_jpeg, read_file
 
 from yolov6.layers.common import DetectBackend
 from yolov6.utils.nms import non_max_suppression
-from yolov6.data.data_augment import letterbox
-from yolov6.core.inferer import Inferer
 from yolov6.utils.events import LOGGER
 from yolov6.utils.events import load_yaml
 
 PATH_YOLOv6 = pathlib.Path(__file__).parent
 DEVICE = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-CLASS_NAMES = load_yaml(str(PATH_YOLOv6/"data/coco.yaml"))['names']
+PRECISIONS = {'fp32': torch.float32, 'fp16': torch.float16, 'bf16': torch.bfloat16}
+
+
+@functools.lru_cache(1)
+def get_class_names():
+    '''COCO class names, read on first use instead of at import time.'''
+    return load_yaml(str(PATH_YOLOv6/"data/coco.yaml"))['names']
+
+
+def __getattr__(name):
+    # keep the module level CLASS_NAMES available without loading the yaml at import time
+    if name == 'CLASS_NAMES':
+        return get_class_names()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def visualize_detections(image,
@@ -27,38 +39,44 @@ def visualize_detections(image,
                          linewidth=2,
                          color='lawngreen'
                          ):
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import PatchCollection
     image = np.array(image, dtype=np.uint8)
+    keep = np.asarray(scores) >= min_score
+    boxes, scores = np.asarray(boxes)[keep], np.asarray(scores)[keep]
+    classes = [name for name, k in zip(classes, keep) if k]
     fig = plt.figure(figsize=figsize)
     plt.axis("off")
     plt.imshow(image)
     ax = plt.gca()
-    for box, name, score in zip(boxes, classes, scores):
-        if score >= min_score:
-            text = "{}: {:.2f}".format(name, score)
-            x1, y1, x2, y2 = box
-            w, h = x2 - x1, y2 - y1
-            patch = plt.Rectangle(
-                [x1, y1], w, h, fill=False, edgecolor=color, linewidth=linewidth
-            )
-            ax.add_patch(patch)
-            ax.text(
-                x1,
-                y1,
-                text,
-                bbox={"facecolor": color, "alpha": 0.8},
-                clip_box=ax.clipbox,
-                clip_on=True,
-            )
+    # draw all boxes as a single collection instead of one patch per box
+    rects = [plt.Rectangle((x1, y1), x2 - x1, y2 - y1) for x1, y1, x2, y2 in boxes]
+    ax.add_collection(PatchCollection(rects, facecolor='none', edgecolor=color, linewidth=linewidth))
+    for (x1, y1, _, _), name, score in zip(boxes, classes, scores):
+        ax.text(
+            x1,
+            y1,
+            "{}: {:.2f}".format(name, score),
+            bbox={"facecolor": color, "alpha": 0.8},
+            clip_box=ax.clipbox,
+            clip_on=True,
+        )
     plt.show()
 
 
+def make_divisible(x, divisor):
+    '''Round x up to the nearest multiple of divisor with integer arithmetic only.'''
+    if divisor & (divisor - 1) == 0:  # power of two, e.g. stride 32
+        return (x + divisor - 1) & -divisor
+    return -(-x // divisor) * divisor
+
+
 def check_img_size(img_size, s=32, floor=0):
-    def make_divisible(x, divisor):
-        return math.ceil(x / divisor) * divisor
+    s = int(s)
     if isinstance(img_size, int):  # integer i.e. img_size=640
-        new_size = max(make_divisible(img_size, int(s)), floor)
+        new_size = max(make_divisible(img_size, s), floor)
     elif isinstance(img_size, list):  # list i.e. img_size=[640, 480]
-        new_size = [max(make_divisible(x, int(s)), floor) for x in img_size]
+        new_size = [max(make_divisible(x, s), floor) for x in img_size]
     else:
         raise Exception(f"Unsupported type of img_size: {type(img_size)}")
 
@@ -68,15 +86,99 @@ def check_img_size(img_size, s=32, floor=0):
     return new_size if isinstance(img_size, list) else [new_size] * 2
 
 
-def process_image(path, img_size, stride):
-    '''Preprocess image before inference.'''
+def letterbox_params(shape, new_shape, auto=True, stride=32):
+    '''Resized (w, h) and (top, bottom, left, right) padding of letterbox for an image of shape (h, w).'''
+    r = min(new_shape[0] / shape[0], new_shape[1] / shape[1])
+    new_unpad = int(round(shape[1] * r)), int(round(shape[0] * r))
+    dw, dh = new_shape[1] - new_unpad[0], new_shape[0] - new_unpad[1]  # wh padding
+    if auto:  # minimum rectangle
+        dw, dh = dw % stride, dh % stride
+    dw /= 2  # divide padding into 2 sides
+    dh /= 2
+    return new_unpad, (int(round(dh - 0.1)), int(round(dh + 0.1)), int(round(dw - 0.1)), int(round(dw + 0.1)))
+
+
+def letterbox_into(im, new_shape, out, color=114, auto=True, stride=32):
+    '''Resize and pad an HWC uint8 array the same way as letterbox, writing the result into out.
+    out is a flat uint8 tensor, the result is returned as an HWC tensor viewing it.
+    cv2.resize writes straight into the unpadded region and only the border is filled, so no intermediate is allocated.
+    '''
+    import cv2
+    (w, h), (top, bottom, left, right) = letterbox_params(im.shape[:2], new_shape, auto, stride)
+    image = out[:(h + top + bottom) * (w + left + right) * 3].view(h + top + bottom, w + left + right, 3)
+    array = image.numpy()
+    array[:top] = color
+    array[top + h:] = color
+    array[top:top + h, :left] = color
+    array[top:top + h, left + w:] = color
+    if im.shape[:2] != (h, w):  # resize
+        cv2.resize(im, (w, h), dst=array[top:top + h, left:left + w], interpolation=cv2.INTER_LINEAR)
+    else:
+        array[top:top + h, left:left + w] = im
+    return image
+
+
+def letterbox_tensor(im, new_shape, color=114, auto=True, stride=32, out=None):
+    '''Resize and pad a CHW image tensor the same way as letterbox, on the tensor's device.
+    If out is given (a flat tensor on the same device), the result is written into it with channels_last strides,
+    only the resize result is then allocated.
+    '''
+    (w, h), (top, bottom, left, right) = letterbox_params(im.shape[1:], new_shape, auto, stride)
+    resize = tuple(im.shape[1:]) != (h, w)
+    if out is None:
+        im = im.float()
+        if resize:
+            im = F.interpolate(im[None], size=(h, w), mode='bilinear', align_corners=False)[0]
+        return F.pad(im, (left, right, top, bottom), value=float(color))
+    image = out[:(h + top + bottom) * (w + left + right) * 3].view(h + top + bottom, w + left + right, 3)
+    image = image.permute(2, 0, 1)  # CHW view with channels_last strides
+    if resize:
+        im = F.interpolate(im.float()[None], size=(h, w), mode='bilinear', align_corners=False)[0]
+    image.fill_(color)
+    image[:, top:top + h, left:left + w].copy_(im)
+    return image
+
+
+def process_image_cuda(path, img_size, stride, device, auto=True, out=None):
+    '''Preprocess JPEG image on GPU, decoding is done by nvJPEG.
+    If out is given (a flat tensor on the device), the letterboxed image is written into it in its dtype.
+    '''
+    img_src = decode_jpeg(read_file(str(path)), mode=ImageReadMode.RGB, device=device)  # CHW uint8, RGB
+    image = letterbox_tensor(img_src, img_size, auto=auto, stride=stride, out=out)
+    if out is None:
+        image = image[None].contiguous(memory_format=torch.channels_last)[0]  # same layout as the CPU path
+    return image, img_src.permute(1, 2, 0)  # keep img_src in HWC layout as the CPU path
+
+
+def process_image(path, img_size, stride, device=None, auto=True, out=None, device_out=None):
+    '''Preprocess image before inference, pixel values are kept in [0, 255].
+    When the target device is a GPU, the CPU result is allocated in pinned memory so it can be copied asynchronously.
+    If out is given (a flat uint8 tensor of at least 3 * img_size elements), the CPU result is written into it.
+    JPEG images are decoded on the GPU instead, and written into device_out (a flat tensor on the device) if given.
+    '''
+    cuda = device is not None and torch.device(device).type == 'cuda'
+    if cuda and pathlib.Path(path).suffix.lower() in ('.jpg', '.jpeg'):
+        return process_image_cuda(path, img_size, stride, device, auto=auto, out=device_out)
+    from PIL import Image
     img_src = np.asarray(Image.open(path).convert('RGB'))
-    image = letterbox(img_src, img_size, stride=stride)[0]
-    image = image.transpose((2, 0, 1))[::-1]  # HWC to CHW, BGR to RGB
-    image = torch.from_numpy(np.ascontiguousarray(image))
-    image = image.float()
-    image /= 255
-    return image, img_src
+    if out is None:
+        out = torch.empty(3 * img_size[0] * img_size[1], dtype=torch.uint8, pin_memory=cuda)
+    image = letterbox_into(img_src, img_size, out, auto=auto, stride=stride)  # HWC, PIL already gives RGB
+    return image.permute(2, 0, 1), img_src  # CHW view with channels_last strides, no transpose copy
+
+
+def rescale_boxes(boxes, img_shape, src_shape):
+    '''Rescale xyxy boxes in place from the letterboxed image to the source image, same as Inferer.rescale(...).round().
+    Scalar ops on the x and y column slices replace the index list gathers of Inferer.rescale.
+    '''
+    ratio = min(img_shape[0] / src_shape[0], img_shape[1] / src_shape[1])
+    pad_w, pad_h = (img_shape[1] - src_shape[1] * ratio) / 2, (img_shape[0] - src_shape[0] * ratio) / 2
+    boxes[:, 0::2].sub_(pad_w)
+    boxes[:, 1::2].sub_(pad_h)
+    boxes.div_(ratio)
+    boxes[:, 0::2].clamp_(0, src_shape[1])
+    boxes[:, 1::2].clamp_(0, src_shape[0])
+    return boxes.round_()
 
 
 class Detector(DetectBackend):
@@ -87,37 +189,220 @@ class Detector(DetectBackend):
                  img_size=640,
                  conf_thres=0.25,
                  iou_thres=0.45,
-                 max_det=1000):
+                 max_det=1000,
+                 jit=False,
+                 precision='fp32',
+                 use_compile=False,
+                 max_cuda_graphs=4):
         super().__init__(ckpt_path, device)
+        assert not (jit and use_compile), 'jit and use_compile can not be used together.'
+        assert precision in PRECISIONS, f'precision must be one of {list(PRECISIONS)}, however {precision} is provided, ' \
+                                        f'for int8 inference please build a TensorRT engine following deploy/TensorRT.'
+        if precision == 'fp16' and torch.device(device).type == 'cpu':
+            LOGGER.warning('fp16 is not supported on cpu, fall back to fp32.')
+            precision = 'fp32'
         self.class_names = class_names
-        self.model.float()
+        self.precision = precision
+        self.dtype = PRECISIONS[precision]
+        self.model_switch()
+        if precision == 'bf16':
+            # bf16's 8 bit significand would snap decoded pixel coordinates to 2 px steps above 256 and 4 px above 512,
+            # so the Detect head, which decodes the boxes, stays in fp32 and gets its features cast up
+            self.model.backbone.to(self.dtype)
+            self.model.neck.to(self.dtype)
+            self.model.detect.register_forward_pre_hook(lambda module, args: ([x.float() for x in args[0]],))
+        else:
+            self.model.to(self.dtype)
+        self.model.to(memory_format=torch.channels_last).eval()  # NHWC convolution kernels
+        for p in self.model.parameters():
+            p.requires_grad_(False)
         self.device = device
         self.img_size = check_img_size(img_size)
         self.conf_thres = conf_thres
         self.iou_thres = iou_thres
         self.max_det = max_det
+        self.nms_dispatch_threshold = None  # boxes.numel() above which NMS runs per class, see batched_nms
+        if jit:
+            self.model = self.load_jit_model(ckpt_path)
+        self.compiled = use_compile and self.compile_model()
+        # CUDA graphs are captured on first use for each batch size at img_size, at most max_cuda_graphs are kept.
+        # reduce-overhead compile mode records its own graphs, so they are disabled for a compiled model.
+        self.max_cuda_graphs = max_cuda_graphs if torch.device(device).type == 'cuda' and not self.compiled else 0
+        self.cuda_graphs = collections.OrderedDict()  # input shape -> (graph, static input, static output), LRU order
+        self.cuda_graph_pool = None  # memory pool shared by all captured graphs
+        # a traced, compiled or graph captured model is specialized to img_size, so no minimum rectangle letterbox
+        self.auto = not (jit or use_compile or self.max_cuda_graphs)
+        self.copy_stream = torch.cuda.Stream() if torch.device(device).type == 'cuda' else None
+        # input buffers reused by predict, a letterboxed image is never larger than img_size
+        buffer_size = 3 * self.img_size[0] * self.img_size[1]
+        self.host_buffer = torch.empty(buffer_size, dtype=torch.uint8, pin_memory=self.copy_stream is not None)
+        self.device_buffer = torch.empty(buffer_size, dtype=torch.uint8, device=device)  # uint8 staging for the copy
+        self.input_buffer = torch.empty(buffer_size, dtype=self.dtype, device=device)  # model input
+
+    def model_switch(self):
+        '''Switch RepVGG blocks to deploy status, conv and bn of other blocks are fused by load_checkpoint.'''
+        from yolov6.layers.common import RepVGGBlock
+        for layer in self.model.modules():
+            if isinstance(layer, RepVGGBlock):
+                layer.switch_to_deploy()
+
+    def dummy_input(self, batch_size=1):
+        '''Zero input of img_size, in the dtype and memory format used for inference.'''
+        return torch.zeros(batch_size, 3, *self.img_size, device=self.device,
+                           dtype=self.dtype).contiguous(memory_format=torch.channels_last)
 
+    def load_jit_model(self, ckpt_path):
+        '''Trace the model on img_size and cache the optimized TorchScript module next to the checkpoint.
+        The cache file is keyed by the checkpoint's mtime and size, so a retrained checkpoint at the same path is traced again.
+        '''
+        stat = os.stat(ckpt_path)
+        jit_path = pathlib.Path(ckpt_path).with_suffix('.{:x}-{:x}.{}x{}.{}.{}.torchscript'.format(
+            stat.st_mtime_ns, stat.st_size, *self.img_size, torch.device(self.device).type, self.precision))
+        if jit_path.is_file():
+            LOGGER.info(f'Loading TorchScript model from {jit_path}')
+            return torch.jit.load(str(jit_path), map_location=self.device)
+        with torch.no_grad():
+            model = torch.jit.trace(self.model, self.dummy_input(), strict=False)
+        model = torch.jit.optimize_for_inference(torch.jit.freeze(model.eval()))
+        try:
+            torch.jit.save(model, str(jit_path))
+            LOGGER.info(f'Saved TorchScript model to {jit_path}')
+        except OSError as e:  # e.g. read-only checkpoint directory, keep the in-memory trace
+            LOGGER.warning(f'Failed to save TorchScript model to {jit_path}: {e}')
+        return model
+
+    def compile_model(self):
+        '''Compile the model for img_size with torch.compile, keep the eager model if compiling fails.'''
+        eager_model = self.model
+        try:
+            self.model = torch.compile(self.model, mode='reduce-overhead', dynamic=False, fullgraph=True)
+            x = self.dummy_input()
+            with torch.inference_mode():
+                for _ in range(2):  # warmup, compilation and cuda graph recording happen on the first calls
+                    self.model(x)
+        except Exception as e:  # torch.compile is not available before torch 2.0
+            LOGGER.warning(f'torch.compile failed, fall back to eager mode: {e}')
+            self.model = eager_model
+            return False
+        return True
+
+    @torch.inference_mode()
     def forward(self, x, src_shape):
-        pred_results = super().forward(x)
+        pred_results = self.run_model(x)
+        return self.postprocess(pred_results, x.shape[2:], [src_shape])[0]
+
+    def postprocess(self, pred_results, img_shape, src_shapes):
+        '''Run NMS on a batch of raw predictions and rescale boxes to each source image.'''
+        pred_results = pred_results.float()  # class offsets in batched NMS overflow fp16
         classes = None  # the classes to keep
-        det = non_max_suppression(pred_results, self.conf_thres, self.iou_thres,
-                                  classes, agnostic=False, max_det=self.max_det)[0]
+        dets = non_max_suppression(pred_results, self.conf_thres, self.iou_thres,
+                                   classes, agnostic=False, max_det=self.max_det,
+                                   dispatch_threshold=self.nms_dispatch_threshold)
+        predictions = []
+        for det, src_shape in zip(dets, src_shapes):
+            rescale_boxes(det[:, :4], img_shape, src_shape[:2])
+            boxes = det[:, :4]
+            scores = det[:, 4]
+            labels = det[:, 5].long()
+            predictions.append({'boxes': boxes, 'scores': scores, 'labels': labels})
+        return predictions
 
-        det[:, :4] = Inferer.rescale(
-            x.shape[2:], det[:, :4], src_shape).round()
-        boxes = det[:, :4]
-        scores = det[:, 4]
-        labels = det[:, 5].long()
-        prediction = {'boxes': boxes, 'scores': scores, 'labels': labels}
-        return prediction
+    def capture_cuda_graph(self, x):
+        '''Capture the model forward on inputs with the shape and layout of x as a CUDA graph.'''
+        static_in = torch.zeros_like(x)
+        side_stream = torch.cuda.Stream()
+        side_stream.wait_stream(torch.cuda.current_stream())
+        with torch.cuda.stream(side_stream):
+            for _ in range(3):  # warmup, cudnn autotuning must not happen during capture
+                super().forward(static_in)
+        torch.cuda.current_stream().wait_stream(side_stream)
 
+        if self.cuda_graph_pool is None:
+            self.cuda_graph_pool = torch.cuda.graph_pool_handle()
+        graph = torch.cuda.CUDAGraph()
+        # sharing the pool is safe since graphs are never replayed concurrently and
+        # each static output is consumed before the next replay
+        with torch.cuda.graph(graph, pool=self.cuda_graph_pool):
+            static_out = super().forward(static_in)
+        self.cuda_graphs[tuple(x.shape)] = graph, static_in, static_out
+        return self.cuda_graphs[tuple(x.shape)]
+
+    def run_model(self, x):
+        '''Run the model on a batch, replaying the CUDA graph captured for its shape on GPU.
+        A graph is captured on first use for each batch size at img_size, and the least recently used one is
+        dropped once max_cuda_graphs are kept. Other input sizes run eagerly.
+        '''
+        if not self.max_cuda_graphs or list(x.shape[2:]) != list(self.img_size):
+            return super().forward(x)
+        key = tuple(x.shape)
+        if key in self.cuda_graphs:
+            self.cuda_graphs.move_to_end(key)
+        else:
+            if len(self.cuda_graphs) >= self.max_cuda_graphs:
+                self.cuda_graphs.popitem(last=False)
+            self.capture_cuda_graph(x)
+        graph, static_in, static_out = self.cuda_graphs[key]
+        static_in.copy_(x, non_blocking=True)
+        graph.replay()
+        return static_out
+
+    def prepare_input(self, img, staging=None, out=None):
+        '''Copy a preprocessed uint8 image to the device on a side stream, then convert it to self.dtype in [0, 1].
+        The copy is staged in uint8 with the strides of img (channels_last from process_image), so it is a plain
+        memcpy from pinned memory, and the conversion runs on the device afterwards.
+        If staging (a flat uint8 tensor on the device) or out (a flat self.dtype tensor on the device) are given,
+        the copy is staged in and the result written into them.
+        '''
+        if img.dtype == self.dtype:  # letterboxed on the device by process_image_cuda, normalize in place
+            return img.div_(255)
+        if img.is_cuda or self.copy_stream is None:  # decoded by nvJPEG, or inference on cpu
+            src = img
+        else:
+            if staging is None:
+                src = torch.empty_like(img, device=self.device)
+            else:
+                src = staging[:img.numel()].as_strided(img.shape, img.stride())
+            current_stream = torch.cuda.current_stream()
+            self.copy_stream.wait_stream(current_stream)  # src may still be read by the previous conversion
+            with torch.cuda.stream(self.copy_stream):
+                src.copy_(img, non_blocking=True)
+            current_stream.wait_stream(self.copy_stream)
+        if out is None:
+            return src.to(self.dtype).div_(255)  # keeps the channels_last strides of img
+        return out[:img.numel()].as_strided(img.shape, img.stride()).copy_(src).div_(255)
+
+    @torch.inference_mode()
     def predict(self, img_path):
-        img, img_src = process_image(img_path, self.img_size, 32)
-        img = img.to(self.device)
+        # predict returns only after the results are copied back to the host,
+        # so the persistent buffers are free again for the next call.
+        # The letterbox and the input go through them without allocating, what still allocates per frame is
+        # the image decode (PIL or nvJPEG) and, on the nvJPEG path, the float resize result.
+        img, img_src = process_image(img_path, self.img_size, 32, self.device, auto=self.auto,
+                                     out=self.host_buffer, device_out=self.input_buffer)
+        img = self.prepare_input(img, staging=self.device_buffer, out=self.input_buffer)
         if len(img.shape) == 3:
             img = img[None]
 
         prediction = self.forward(img, img_src.shape)
+        return self.format_prediction(prediction)
+
+    @torch.inference_mode()
+    def predict_batch(self, img_paths):
+        '''Predict a list of images in one forward pass, all images are letterboxed to img_size.
+        On GPU the forward replays a CUDA graph captured on the first call with the same number of images,
+        graphs for up to max_cuda_graphs batch sizes are kept (max_cuda_graphs=0 runs eagerly).
+        '''
+        imgs, img_srcs = [], []
+        for path in img_paths:
+            img, img_src = process_image(path, self.img_size, 32, self.device, auto=False)
+            imgs.append(self.prepare_input(img))  # the copy overlaps with decoding the next image
+            img_srcs.append(img_src)
+        img = torch.stack(imgs).contiguous(memory_format=torch.channels_last)
+        pred_results = self.run_model(img)
+        predictions = self.postprocess(pred_results, img.shape[2:], [im.shape for im in img_srcs])
+        return [self.format_prediction(prediction) for prediction in predictions]
+
+    def format_prediction(self, prediction):
         out = {k: v.cpu().numpy() for k, v in prediction.items()}
         out['classes'] = [self.class_names[i] for i in out['labels']]
         return out
@@ -128,6 +413,7 @@ class Detector(DetectBackend):
                      figsize=(16, 16),
                      color='lawngreen',
                      linewidth=2):
+        from PIL import Image
         prediction = self.predict(img_path)
         boxes, scores, classes = prediction['boxes'], prediction['scores'], prediction['classes']
         visualize_detections(Image.open(img_path),
@@ -136,39 +422,51 @@ class Detector(DetectBackend):
                              )
 
 
-def create_model(model_name, class_names=CLASS_NAMES, device=DEVICE,
-                 img_size=640, conf_thres=0.25, iou_thres=0.45, max_det=1000):
-    if not os.path.exists(str(PATH_YOLOv6/'weights')):
-        os.mkdir(str(PATH_YOLOv6/'weights'))
-    if not os.path.exists(str(PATH_YOLOv6/'weights') + f'/{model_name}.pt'):
-        torch.hub.load_state_dict_from_url(
-            f"https://github.com/meituan/YOLOv6/releases/download/0.3.0/{model_name}.pt",
-            str(PATH_YOLOv6/'weights'))
-    return Detector(str(PATH_YOLOv6/'weights') + f'/{model_name}.pt',
+@functools.lru_cache()
+def get_weights(model_name):
+    '''Return the local checkpoint path of a released model, downloading it on first use.'''
+    weights = PATH_YOLOv6/'weights'/f'{model_name}.pt'
+    if not weights.is_file():
+        weights.parent.mkdir(parents=True, exist_ok=True)
+        # download_url_to_file writes to a temporary file and moves it, so an interrupted download leaves no partial checkpoint
+        torch.hub.download_url_to_file(
+            f"https://github.com/meituan/YOLOv6/releases/download/0.3.0/{model_name}.pt", str(weights))
+    return str(weights)
+
+
+def create_model(model_name, class_names=None, device=DEVICE,
+                 img_size=640, conf_thres=0.25, iou_thres=0.45, max_det=1000, **kwargs):
+    '''Build a Detector from released weights, kwargs (jit, precision, use_compile, max_cuda_graphs)
+    are passed to Detector.
+    '''
+    if class_names is None:
+        class_names = get_class_names()
+    return Detector(get_weights(model_name),
                     class_names, device, img_size=img_size, conf_thres=conf_thres,
-                    iou_thres=iou_thres, max_det=max_det)
+                    iou_thres=iou_thres, max_det=max_det, **kwargs)
 
 
-def yolov6n(class_names=CLASS_NAMES, device=DEVICE, img_size=640, conf_thres=0.25, iou_thres=0.45, max_det=1000):
+def yolov6n(class_names=None, device=DEVICE, img_size=640, conf_thres=0.25, iou_thres=0.45, max_det=1000, **kwargs):
     return create_model('yolov6n', class_names, device, img_size=img_size, conf_thres=conf_thres,
-                        iou_thres=iou_thres, max_det=max_det)
+                        iou_thres=iou_thres, max_det=max_det, **kwargs)
 
 
-def yolov6s(class_names=CLASS_NAMES, device=DEVICE, img_size=640, conf_thres=0.25, iou_thres=0.45, max_det=1000):
+def yolov6s(class_names=None, device=DEVICE, img_size=640, conf_thres=0.25, iou_thres=0.45, max_det=1000, **kwargs):
     return create_model('yolov6s', class_names, device, img_size=img_size, conf_thres=conf_thres,
-                        iou_thres=iou_thres, max_det=max_det)
+                        iou_thres=iou_thres, max_det=max_det, **kwargs)
 
 
-def yolov6m(class_names=CLASS_NAMES, device=DEVICE, img_size=640, conf_thres=0.25, iou_thres=0.45, max_det=1000):
+def yolov6m(class_names=None, device=DEVICE, img_size=640, conf_thres=0.25, iou_thres=0.45, max_det=1000, **kwargs):
     return create_model('yolov6m', class_names, device, img_size=img_size, conf_thres=conf_thres,
-                        iou_thres=iou_thres, max_det=max_det)
+                        iou_thres=iou_thres, max_det=max_det, **kwargs)
 
 
-def yolov6l(class_names=CLASS_NAMES, device=DEVICE, img_size=640, conf_thres=0.25, iou_thres=0.45, max_det=1000):
+def yolov6l(class_names=None, device=DEVICE, img_size=640, conf_thres=0.25, iou_thres=0.45, max_det=1000, **kwargs):
     return create_model('yolov6l', class_names, device, img_size=img_size, conf_thres=conf_thres,
-                        iou_thres=iou_thres, max_det=max_det)
+                        iou_thres=iou_thres, max_det=max_det, **kwargs)
 
 
-def custom(ckpt_path, class_names, device=DEVICE, img_size=640, conf_thres=0.25, iou_thres=0.45, max_det=1000):
+def custom(ckpt_path, class_names, device=DEVICE, img_size=640, conf_thres=0.25, iou_thres=0.45, max_det=1000,
+           **kwargs):
     return Detector(ckpt_path, class_names, device, img_size=img_size, conf_thres=conf_thres,
-                    iou_thres=iou_thres, max_det=max_det)
+                    iou_thres=iou_thres, max_det=max_det, **kwargs)
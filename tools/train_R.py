@@ -4,6 +4,7 @@ import argparse
 import os
 import os.path as osp
 import sys
+import threading
 import warnings
 from logging import Logger
 from pathlib import Path
@@ -36,7 +37,20 @@ def get_args_parser(add_help=True):
     parser.add_argument("--img-size", default=800, type=int, help="train, val image size (pixels)")
     parser.add_argument("--batch-size", default=1, type=int, help="total batch size for all GPUs")
     parser.add_argument("--epochs", default=400, type=int, help="number of total epochs to run")
-    parser.add_argument("--workers", default=8, type=int, help="number of data loading workers (default: 8)")
+    parser.add_argument(
+        "--workers", default=8, type=int, help="number of data loading workers, -1 to autodetect (default: 8)"
+    )
+    parser.add_argument(
+        "--no-pin-memory", dest="pin_memory", action="store_false", help="do not use pinned memory in dataloaders"
+    )
+    parser.add_argument(
+        "--cuda-prefetch",
+        action="store_true",
+        help="copy the next train batch to GPU on a side stream while the current step runs",
+    )
+    parser.add_argument(
+        "--prefetch-factor", default=2, type=int, help="batches loaded in advance by each worker (default: 2)"
+    )
     parser.add_argument("--device", default="0", type=str, help="cuda device, i.e. 0 or 0,1,2,3 or cpu")
     parser.add_argument("--eval-interval", default=1, type=int, help="evaluate at every interval epochs")
     parser.add_argument("--eval-final-only", action="store_true", help="only evaluate at the final epoch")
@@ -90,7 +104,7 @@ def get_args_parser(add_help=True):
 
 
 def check_and_init(args):
-    """check config files and device."""
+    """check config files and device, return a callback which saves args and config to save_dir."""
     # logging
 
     # check files
@@ -126,22 +140,28 @@ def check_and_init(args):
     # set random seed
     set_random_seed(1 + args.rank, deterministic=(args.rank == -1))
     # set_random_seed(1 + args.rank, deterministic=False)
-    # save args
-    if master_process:
-        save_yaml(vars(args), osp.join(args.save_dir, "args.yaml"))
+    # save args and config, deferred by the caller so that writing them does not delay the Trainer setup
+    args_dict = dict(vars(args))
+    save_dir, conf_file = args.save_dir, args.conf_file
+
+    def save_args():
+        if master_process:
+            save_yaml(args_dict, osp.join(save_dir, "args.yaml"))
+            copy(Path(conf_file), Path(save_dir) / str(Path(conf_file).name))
 
-        # save config
-        copy(Path(args.conf_file), Path(args.save_dir) / str(Path(args.conf_file).name))
-    return cfg, device, args
+    return cfg, device, args, save_args
 
 
 def main(args):
     """main function of training"""
     # Setup
-    args.local_rank, args.rank, args.world_size = get_envs()
-    cfg, device, args = check_and_init(args)
-    # reload envs because args was chagned in check_and_init(args)
-    args.local_rank, args.rank, args.world_size = get_envs()
+    envs = get_envs()
+    args.local_rank, args.rank, args.world_size = envs
+    cfg, device, args, save_args = check_and_init(args)
+    # restore envs because args is reloaded from args.yaml in check_and_init(args) when resuming
+    args.local_rank, args.rank, args.world_size = envs
+    if args.workers == -1:
+        args.workers = min(os.cpu_count(), 2 * max(torch.cuda.device_count(), 1))
     LOGGER.info(f"training args are: {args}\n")
     if args.local_rank != -1:  # if DDP mode
         torch.cuda.set_device(args.local_rank)
@@ -157,6 +177,7 @@ def main(args):
     # Start
     # NOTE Trainer
     trainer = Trainer(args, cfg, device)
+    threading.Thread(target=save_args).start()  # write args and config in the background
     # PTQ
     if args.quant and args.calib:
         trainer.calibrate(cfg)
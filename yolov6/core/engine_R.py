@@ -37,6 +37,7 @@ from yolov6.utils.ema import ModelEMA, de_parallel
 from yolov6.utils.events_R import LOGGER, NCOLS, load_yaml, write_tbimg, write_tblog
 from yolov6.utils.general import download_ckpt
 from yolov6.utils.nms_R import xywh2xyxy, xyxy2xywh
+from yolov6.utils.prefetcher import CUDAPrefetcher
 from yolov6.utils.RepOptimizer import RepVGGOptimizer, extract_scales
 
 
@@ -555,7 +556,10 @@ class Trainer:
         # TODO
         # LOGGER.info(("\n" + "%10s" * (self.loss_num + 1)) % (*self.loss_info,))
 
-        self.pbar = enumerate(self.train_loader)
+        if getattr(self.args, "cuda_prefetch", False) and torch.device(self.device).type == "cuda":
+            self.pbar = enumerate(CUDAPrefetcher(self.train_loader, self.device))
+        else:
+            self.pbar = enumerate(self.train_loader)
         if self.main_process:
             # self.pbar = tqdm(
             #     self.pbar, total=self.max_stepnum, ncols=NCOLS, bar_format="{l_bar}{bar:10}{r_bar}{bar:-10b}"
@@ -696,6 +700,8 @@ class Trainer:
             rect=False,
             rank=args.local_rank,
             workers=args.workers,
+            pin_memory=getattr(args, "pin_memory", True),
+            prefetch_factor=getattr(args, "prefetch_factor", 2),
             shuffle=True,
             check_images=args.check_images,
             check_labels=args.check_labels,
@@ -716,6 +722,8 @@ class Trainer:
                 rank=-1,
                 pad=0.5,
                 workers=args.workers,
+                pin_memory=getattr(args, "pin_memory", True),
+                prefetch_factor=getattr(args, "prefetch_factor", 2),
                 check_images=args.check_images,
                 check_labels=args.check_labels,
                 data_dict=data_dict,
@@ -24,6 +24,8 @@ def create_dataloader(
     rect=False,
     rank=-1,
     workers=8,
+    pin_memory=True,
+    prefetch_factor=2,
     shuffle=False,
     data_dict=None,
     task="Train",
@@ -62,6 +64,9 @@ def create_dataloader(
             workers,
         ]
     )  # number of workers
+    # prefetch_factor is only accepted with worker processes. Workers are already kept alive
+    # across epochs by TrainValDataLoader, so persistent_workers is not needed.
+    loader_kwargs = dict(prefetch_factor=prefetch_factor) if workers > 0 else {}
     sampler = (
         None if rank == -1 else distributed.DistributedSampler(dataset, shuffle=shuffle)
     )
@@ -72,8 +77,9 @@ def create_dataloader(
             shuffle=shuffle and sampler is None,
             num_workers=workers,
             sampler=sampler,
-            pin_memory=True,
+            pin_memory=pin_memory,
             collate_fn=TrainValDataset.collate_fn,
+            **loader_kwargs,
         ),
         dataset,
     )
@@ -237,6 +237,8 @@ class TrainValDataset(Dataset):
             p for p in img_paths if p.split(".")[-1].lower() in IMG_FORMATS and os.path.isfile(p)
         )
         assert img_paths, f"No images found in {img_dir}."
+        # send files to the check pool in chunks, per-task IPC dominates when checking tens of thousands of files
+        chunksize = max(1, min(64, len(img_paths) // (NUM_THREADS * 4)))
 
         img_hash = self.get_hash(img_paths)
         if osp.exists(valid_img_record):
@@ -258,7 +260,7 @@ class TrainValDataset(Dataset):
             )
             with Pool(NUM_THREADS) as pool:
                 pbar = tqdm(
-                    pool.imap(TrainValDataset.check_image, img_paths),
+                    pool.imap(TrainValDataset.check_image, img_paths, chunksize=chunksize),
                     total=len(img_paths),
                 )
                 for img_path, shape_per_img, nc_per_img, msg in pbar:
@@ -316,8 +318,8 @@ class TrainValDataset(Dataset):
                 f"{self.task}: Checking formats of labels with {NUM_THREADS} process(es): "
             )
             with Pool(NUM_THREADS) as pool:
-                pbar = pool.imap(
-                    TrainValDataset.check_label_files, zip(img_paths, label_paths)
+                pbar = pool.imap_unordered(
+                    TrainValDataset.check_label_files, zip(img_paths, label_paths), chunksize=chunksize
                 ) # NOTE 线程, check_label_files
                 pbar = tqdm(pbar, total=len(label_paths)) if self.main_process else pbar
                 for (
@@ -181,6 +181,8 @@ class TrainValDataset(Dataset):
         img_paths = glob.glob(osp.join(img_dir, "**/*"), recursive=True)  # NOTE 查找所有 img_path
         img_paths = sorted(p for p in img_paths if p.split(".")[-1].lower() in IMG_FORMATS and os.path.isfile(p))
         assert img_paths, f"No images found in {img_dir}."
+        # send files to the check pool in chunks, per-task IPC dominates when checking tens of thousands of files
+        chunksize = max(1, min(64, len(img_paths) // (NUM_THREADS * 4)))
 
         img_hash = self.get_hash(img_paths)
         if osp.exists(valid_img_record):
@@ -199,7 +201,7 @@ class TrainValDataset(Dataset):
             nc, msgs = 0, []  # number corrupt, messages
             LOGGER.info(f"{self.task}: Checking formats of images with {NUM_THREADS} process(es): ")
             with Pool(NUM_THREADS) as pool:
-                pbar = tqdm(pool.imap(TrainValDataset.check_image, img_paths), total=len(img_paths),)
+                pbar = tqdm(pool.imap(TrainValDataset.check_image, img_paths, chunksize=chunksize), total=len(img_paths),)
                 for img_path, shape_per_img, nc_per_img, msg in pbar:
                     if nc_per_img == 0:  # not corrupted
                         img_info[img_path] = {"shape": shape_per_img}
@@ -246,8 +248,8 @@ class TrainValDataset(Dataset):
             nm, nf, ne, nc, msgs = 0, 0, 0, 0, []  # number corrupt, messages
             LOGGER.info(f"{self.task}: Checking formats of labels with {NUM_THREADS} process(es): ")
             with Pool(NUM_THREADS) as pool:
-                pbar = pool.imap(
-                    TrainValDataset.check_label_files, zip(img_paths, label_paths)
+                pbar = pool.imap_unordered(
+                    TrainValDataset.check_label_files, zip(img_paths, label_paths), chunksize=chunksize
                 )  # NOTE 线程, check_label_files
                 pbar = tqdm(pbar, total=len(label_paths)) if self.main_process else pbar
                 for (img_path, labels_per_file, nc_per_file, nm_per_file, nf_per_file, ne_per_file, msg,) in pbar:
@@ -482,6 +482,7 @@ class DetectBackend(nn.Module):
         stride = int(model.stride.max())
         self.__dict__.update(locals())  # assign all variables to self
 
+    @torch.inference_mode()
     def forward(self, im, val=False):
         y, _ = self.model(im)
         if isinstance(y, np.ndarray):
@@ -5,6 +5,7 @@
 
 import os
 import time
+import functools
 import numpy as np
 import cv2
 import torch
@@ -28,7 +29,53 @@ def xywh2xyxy(x):
     return y
 
 
-def non_max_suppression(prediction, conf_thres=0.25, iou_thres=0.45, classes=None, agnostic=False, multi_label=False, max_det=300):
+@functools.lru_cache(1)
+def get_mmcv_nms():
+    '''mmcv's CUDA NMS which gathers kept boxes on device, imported on first use since it loads the mmcv ops extension.'''
+    try:
+        from mmcv.ops import nms as mmcv_nms
+    except ImportError:
+        return None
+    return mmcv_nms
+
+
+def nms(boxes, scores, iou_thres):
+    '''Class-agnostic NMS, returns the indices of kept boxes sorted by decreasing score.
+    For float32 boxes on GPU, mmcv's kernel is preferred because it unwraps the suppression mask
+    on device instead of copying it to the host like torchvision.ops.nms does.
+    mmcv only supports float32, so other dtypes (e.g. fp16 from half precision eval) use torchvision.
+    '''
+    if boxes.is_cuda and boxes.dtype == torch.float32:
+        mmcv_nms = get_mmcv_nms()
+        if mmcv_nms is not None:
+            return mmcv_nms(boxes, scores, iou_thres)[1]
+    return torchvision.ops.nms(boxes, scores, iou_thres)
+
+
+def batched_nms(boxes, scores, idxs, iou_thres, max_wh=4096, dispatch_threshold=None):
+    '''Per-class NMS, dispatched the same way as torchvision.ops.batched_nms.
+    Small inputs offset the boxes of each class apart and run a single NMS, large inputs
+    run one NMS per class since the memory of a single NMS grows quadratically with the box number.
+    Args:
+        idxs: (tensor), with shape [N], the class index of each box.
+        dispatch_threshold: (None or int), boxes.numel() above which per-class NMS is used,
+            default is 4000 on cpu and 20000 on gpu.
+    '''
+    if dispatch_threshold is None:
+        dispatch_threshold = 4000 if boxes.device.type == 'cpu' else 20000
+    if boxes.numel() <= dispatch_threshold:
+        return nms(boxes + idxs[:, None] * max_wh, scores, iou_thres)
+
+    keep_mask = torch.zeros_like(scores, dtype=torch.bool)
+    for class_id in torch.unique(idxs):
+        class_box_idx = torch.where(idxs == class_id)[0]
+        keep_mask[class_box_idx[nms(boxes[class_box_idx], scores[class_box_idx], iou_thres)]] = True
+    keep_box_idx = torch.where(keep_mask)[0]
+    return keep_box_idx[scores[keep_box_idx].sort(descending=True)[1]]
+
+
+def non_max_suppression(prediction, conf_thres=0.25, iou_thres=0.45, classes=None, agnostic=False, multi_label=False, max_det=300,
+                        dispatch_threshold=None):
     """Runs Non-Maximum Suppression (NMS) on inference results.
     This code is borrowed from: https://github.com/ultralytics/yolov5/blob/47233e1698b89fc437a4fb9463c815e9171be955/utils/general.py#L775
     Args:
@@ -39,17 +86,21 @@ def non_max_suppression(prediction, conf_thres=0.25, iou_thres=0.45, classes=Non
         agnostic: (bool), when it is set to True, we do class-independent nms, otherwise, different class would do nms respectively.
         multi_label: (bool), when it is set to True, one box can have multi labels, otherwise, one box only huave one label.
         max_det:(int), max number of output bboxes.
+        dispatch_threshold: (None or int), see batched_nms.
 
     Returns:
          list of detections, echo item is one tensor with shape (num_boxes, 6), 6 is for [xyxy, conf, cls].
     """
 
-    num_classes = prediction.shape[2] - 5  # number of classes
-    pred_candidates = torch.logical_and(prediction[..., 4] > conf_thres, torch.max(prediction[..., 5:], axis=-1)[0] > conf_thres)  # candidates
     # Check the parameters.
     assert 0 <= conf_thres <= 1, f'conf_thresh must be in 0.0 to 1.0, however {conf_thres} is provided.'
     assert 0 <= iou_thres <= 1, f'iou_thres must be in 0.0 to 1.0, however {iou_thres} is provided.'
 
+    num_classes = prediction.shape[2] - 5  # number of classes
+    # Confidence pre-mask, computed on device for the whole batch before any NMS work.
+    # amax skips the argmax that torch.max would also compute.
+    pred_candidates = (prediction[..., 4] > conf_thres) & (prediction[..., 5:].amax(-1) > conf_thres)  # candidates
+
     # Function settings.
     max_wh = 4096  # maximum box width and height
     max_nms = 30000  # maximum number of boxes put into torchvision.ops.nms()
@@ -91,9 +142,10 @@ def non_max_suppression(prediction, conf_thres=0.25, iou_thres=0.45, classes=Non
             x = x[x[:, 4].argsort(descending=True)[:max_nms]]  # sort by confidence
 
         # Batched NMS
-        class_offset = x[:, 5:6] * (0 if agnostic else max_wh)  # classes
-        boxes, scores = x[:, :4] + class_offset, x[:, 4]  # boxes (offset by class), scores
-        keep_box_idx = torchvision.ops.nms(boxes, scores, iou_thres)  # NMS
+        if agnostic:
+            keep_box_idx = nms(x[:, :4], x[:, 4], iou_thres)
+        else:
+            keep_box_idx = batched_nms(x[:, :4], x[:, 4], x[:, 5], iou_thres, max_wh, dispatch_threshold)
         if keep_box_idx.shape[0] > max_det:  # limit detections
             keep_box_idx = keep_box_idx[:max_det]
 
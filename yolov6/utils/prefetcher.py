@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# The code is based on the data_prefetcher of
+# https://github.com/NVIDIA/apex/blob/master/examples/imagenet/main_amp.py
+import torch
+
+
+class CUDAPrefetcher:
+    """ Wrap a dataloader and copy the next batch to the GPU on a side stream,
+    so the host to device copy overlaps with the training step of the current batch.
+    Tensors of the batch are moved to device, other items (paths, shapes) are returned as they are.
+    """
+
+    def __init__(self, loader, device):
+        self.loader = loader
+        self.device = device
+        self.stream = torch.cuda.Stream(device=device)
+        self.next_batch = None
+
+    def __len__(self):
+        return len(self.loader)
+
+    def __iter__(self):
+        self.loader_iter = iter(self.loader)
+        self.preload()
+        return self
+
+    def __next__(self):
+        if self.next_batch is None:
+            raise StopIteration
+        current_stream = torch.cuda.current_stream(self.device)
+        current_stream.wait_stream(self.stream)
+        batch = self.next_batch
+        for item in batch:
+            if isinstance(item, torch.Tensor):
+                item.record_stream(current_stream)  # the memory was allocated on the side stream
+        self.preload()
+        return batch
+
+    def preload(self):
+        try:
+            batch = next(self.loader_iter)
+        except StopIteration:
+            self.next_batch = None
+            return
+        with torch.cuda.stream(self.stream):
+            self.next_batch = tuple(
+                item.to(self.device, non_blocking=True) if isinstance(item, torch.Tensor) else item
+                for item in batch
+            )